@@ -7,9 +7,12 @@ adding the decorator to the class itself.
 """
 
 import inspect
+import os
 import typing
-from contextlib import suppress
-from functools import wraps
+from functools import lru_cache, wraps
+
+
+_MISSING = object()
 
 
 def _is_unparameterized_special_typing(type_hint):
@@ -22,43 +25,124 @@ def _is_unparameterized_special_typing(type_hint):
         return False
 
 
+@lru_cache(maxsize=None)
+def _resolve_actual_type_cached(type_hint):
+    if _is_unparameterized_special_typing(type_hint):
+        return None
+
+    if getattr(type_hint, "__origin__", None) is typing.Union:
+        # Union[X, Y] / Optional[X]: resolve each member in turn so that
+        # parameterized generics like Tuple[int, int] become their runtime
+        # origin before being handed to isinstance, which rejects
+        # subscripted generics outright.
+        members = []
+        for arg in type_hint.__args__:
+            actual = _resolve_actual_type_cached(arg)
+            if actual is None:
+                # A member like typing.Any matches everything.
+                return None
+            if isinstance(actual, tuple):
+                members.extend(actual)
+            else:
+                members.append(actual)
+        return tuple(members)
+
+    if hasattr(type_hint, "__origin__") and type_hint.__origin__ is not None:
+        return type_hint.__origin__
+    elif hasattr(type_hint, "__args__") and type_hint.__args__ is not None:
+        return type_hint.__args__
+    else:
+        return type_hint
+
+
+def _resolve_actual_type(type_hint):
+    """Resolve a type hint to something usable with isinstance.
+    Returns None for special forms like typing.Any which match any type.
+
+    The same handful of annotations is shared by all Tello methods, so the
+    resolution result is cached; unhashable hints fall through uncached.
+    """
+    try:
+        return _resolve_actual_type_cached(type_hint)
+    except TypeError:
+        return _resolve_actual_type_cached.__wrapped__(type_hint)
+
+
 def enforce_types(target):
     """Class decorator adding type checks to all member functions
-    """
-    def check_types(spec, *args, **kwargs):
-        parameters = dict(zip(spec.args, args))
-        parameters.update(kwargs)
-        for name, value in parameters.items():
-            with suppress(KeyError):  # Assume un-annotated parameters can be any type
-                type_hint = spec.annotations[name]
-                if _is_unparameterized_special_typing(type_hint):
-                    continue
-
-                if hasattr(type_hint, "__origin__") and type_hint.__origin__ is not None:
-                    actual_type = type_hint.__origin__
-                elif hasattr(type_hint, "__args__") and type_hint.__args__ is not None:
-                    actual_type = type_hint.__args__
-                else:
-                    actual_type = type_hint
 
-                if not isinstance(value, actual_type):
-                    raise TypeError("Unexpected type for '{}' (expected {} but found {})"
-                                    .format(name, type_hint, type(value)))
+    Checks are skipped entirely when running under ``python -O`` /
+    ``PYTHONOPTIMIZE`` (the same way assert statements are stripped) or
+    when the environment variable ``TELLO_TYPECHECK`` is set to ``0``.
+    """
+    if not __debug__ or os.environ.get('TELLO_TYPECHECK') == '0':
+        return target
 
     def decorate(func):
+        # Honour @typing.no_type_check: hot-path methods can opt out of
+        # the per-call wrapper entirely.
+        if getattr(func, '__no_type_check__', False):
+            return func
+
         spec = inspect.getfullargspec(func)
 
-        @wraps(func)
+        # Resolve all annotations once at decoration time so the wrapper
+        # only has to iterate a tuple and call isinstance per annotated arg.
+        checks = []
+        for i, name in enumerate(spec.args):
+            if name in spec.annotations:
+                actual_type = _resolve_actual_type(spec.annotations[name])
+                if actual_type is not None:
+                    checks.append((i, name, spec.annotations[name], actual_type))
+        for name in spec.kwonlyargs:
+            if name in spec.annotations:
+                actual_type = _resolve_actual_type(spec.annotations[name])
+                if actual_type is not None:
+                    checks.append((-1, name, spec.annotations[name], actual_type))
+        checks = tuple(checks)
+
+        # Nothing to check: leave the function unwrapped instead of paying
+        # a wrapper frame per call for methods without annotated arguments.
+        if not checks:
+            return func
+
         def wrapper(*args, **kwargs):
-            check_types(spec, *args, **kwargs)
+            for i, name, type_hint, actual_type in checks:
+                if 0 <= i < len(args):
+                    value = args[i]
+                else:
+                    value = kwargs.get(name, _MISSING)
+                    if value is _MISSING:
+                        continue
+
+                # Exact-type match is the overwhelmingly common case for the
+                # int/str/float arguments of the Tello api; isinstance is only
+                # needed as a fallback to preserve subclass semantics.
+                if type(value) is not actual_type and not isinstance(value, actual_type):
+                    raise TypeError("Unexpected type for '{}' (expected {} but found {})"
+                                    .format(name, type_hint, type(value)))
+
             return func(*args, **kwargs)
 
+        # Full metadata copying only matters for the public api surface
+        # (docs, help(), introspection); internal helpers just keep their
+        # name.
+        if func.__name__.startswith('_'):
+            wrapper.__name__ = func.__name__
+        else:
+            wrapper = wraps(func)(wrapper)
+
         return wrapper
 
     if inspect.isclass(target):
-        members = inspect.getmembers(target, predicate=inspect.isfunction)
-        for name, func in members:
-            setattr(target, name, decorate(func))
+        # Walk only the functions defined on the class itself instead of
+        # inspect.getmembers, which sorts and walks the full MRO and would
+        # re-decorate inherited methods.
+        for name, member in list(vars(target).items()):
+            if inspect.isfunction(member):
+                setattr(target, name, decorate(member))
+            elif isinstance(member, staticmethod):
+                setattr(target, name, staticmethod(decorate(member.__func__)))
 
         return target
     else:
@@ -1,8 +1,7 @@
 """Library for controlling multiple DJI Ryze Tello drones.
 """
 
-from threading import Thread, Barrier
-from queue import Queue
+from threading import Thread, Barrier, Event, Semaphore
 from typing import List, Callable
 
 from .tello import Tello, TelloException
@@ -16,8 +15,6 @@ class TelloSwarm:
 
     tellos: List[Tello]
     barrier: Barrier
-    funcBarier: Barrier
-    funcQueues: List[Queue]
     threads: List[Thread]
 
     @staticmethod
@@ -28,7 +25,7 @@ class TelloSwarm:
             path: path to the file
         """
         with open(path, 'r') as fd:
-            ips = fd.readlines()
+            ips = [ip.strip() for ip in fd.read().splitlines() if ip.strip()]
 
         return TelloSwarm.fromIps(ips)
 
@@ -36,6 +33,10 @@ class TelloSwarm:
     def fromIps(ips: list):
         """Create TelloSwarm from a list of IP addresses.
 
+        All drones share the single module-level UDP client socket and its
+        receiver thread, so adding drones does not add sockets or threads
+        on the command path.
+
         Arguments:
             ips: list of IP Addresses
         """
@@ -55,23 +56,44 @@ class TelloSwarm:
             tellos: list of [Tello][tello] instances
         """
         self.tellos = tellos
+        # The drone list never changes after construction, so the
+        # (index, tello) pairs used by sequential() can be built once.
+        self._indexed = tuple(enumerate(tellos))
         self.barrier = Barrier(len(tellos))
-        self.funcBarrier = Barrier(len(tellos) + 1)
-        self.funcQueues = [Queue() for tello in tellos]
+        self._func = None
+
+        # A single-drone swarm needs none of the worker thread machinery;
+        # work is dispatched directly on the calling thread.
+        if len(tellos) == 1:
+            self._single = True
+            self.threads = []
+            return
+
+        self._single = False
+        self._start_events = [Event() for tello in tellos]
+        self._done_sem = Semaphore(0)
 
         def worker(i):
-            queue = self.funcQueues[i]
+            start_event = self._start_events[i]
             tello = self.tellos[i]
 
             while True:
-                func = queue.get()
-                self.funcBarrier.wait()
-                func(i, tello)
-                self.funcBarrier.wait()
+                start_event.wait()
+                start_event.clear()
+                work = self._func
+                try:
+                    if type(work) is tuple:
+                        methods, args, kwargs = work
+                        methods[i](tello, *args, **kwargs)
+                    else:
+                        work(i, tello)
+                finally:
+                    self._done_sem.release()
 
         self.threads = []
         for i, _ in enumerate(tellos):
-            thread = Thread(target=worker, daemon=True, args=(i,))
+            thread = Thread(target=worker, daemon=True, args=(i,),
+                            name='tello-worker-{}'.format(i))
             thread.start()
             self.threads.append(thread)
 
@@ -85,7 +107,7 @@ class TelloSwarm:
         ```
         """
 
-        for i, tello in enumerate(self.tellos):
+        for i, tello in self._indexed:
             func(i, tello)
 
     def parallel(self, func: Callable[[int, Tello], None]):
@@ -100,11 +122,28 @@ class TelloSwarm:
         ```
         """
 
-        for queue in self.funcQueues:
-            queue.put(func)
+        self._broadcast(func)
+
+    def _broadcast(self, work):
+        """Hand one unit of work to every worker thread and wait until all
+        of them have finished. `work` is either a `func(i, tello)` callable
+        or a prebuilt `(method, args, kwargs)` tuple.
+        Internal method, you normally wouldn't call this yourself.
+        """
+        if self._single:
+            if type(work) is tuple:
+                methods, args, kwargs = work
+                methods[0](self.tellos[0], *args, **kwargs)
+            else:
+                work(0, self.tellos[0])
+            return
+
+        self._func = work
+        for event in self._start_events:
+            event.set()
 
-        self.funcBarrier.wait()
-        self.funcBarrier.wait()
+        for _ in self.tellos:
+            self._done_sem.acquire()
 
     def sync(self, timeout: float = None):
         """Sync parallel tello threads. The code continues when all threads
@@ -123,6 +162,9 @@ class TelloSwarm:
         swarm.parallel(doStuff)
         ```
         """
+        if self._single:
+            return 0
+
         return self.barrier.wait(timeout)
 
     def __getattr__(self, attr):
@@ -134,9 +176,19 @@ class TelloSwarm:
         swarm.move_up(50)
         ```
         """
+        # Resolve the method once per drone on its own class — not on the
+        # Tello base class, which would bypass overrides in subclasses —
+        # instead of doing a getattr inside every worker thread per call.
+        unbound = tuple(getattr(type(tello), attr) for tello in self.tellos)
+
         def callAll(*args, **kwargs):
-            self.parallel(lambda i, tello: getattr(tello, attr)(*args, **kwargs))
+            self._broadcast((unbound, args, kwargs))
 
+        callAll.__name__ = attr
+        # __getattr__ only runs when normal lookup fails, so caching the
+        # built callable turns every later access into a plain
+        # instance-dict hit.
+        self.__dict__[attr] = callAll
         return callAll
 
     def __iter__(self):
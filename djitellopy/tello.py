@@ -2,29 +2,127 @@
 """
 
 # coding=utf-8
+import atexit
 import logging
+import os
+import re
+import selectors
 import socket
+import sys
 import time
 from datetime import datetime
-from collections import deque
-from threading import Thread, Lock
-from typing import Optional, Union, Type, Dict
+from collections import deque, namedtuple
+from queue import Queue, Empty
+from functools import lru_cache
+from threading import Thread, Event
+from typing import Optional, Tuple, Union, Type, Dict, no_type_check
 
 from .enforce_types import enforce_types
 
-import av
 import numpy as np
 
 
 threads_initialized = False
 drones: Optional[dict] = {}
 client_socket: socket.socket
+state_socket: socket.socket
+receiver_thread: Optional[Thread] = None
+
+# Signals the receiver thread to exit; set from the atexit hook so the
+# process shuts down without the thread dying on a mid-recv exception.
+stop_event = Event()
+
+
+def _shutdown():
+    stop_event.set()
+    if receiver_thread is not None:
+        receiver_thread.join(1.0)
+
+
+atexit.register(_shutdown)
+
+# Reusable receive buffer; only the single receiver thread touches it, and
+# packets are only copied out of it when they are actually kept.
+receive_buffer = bytearray(2048)
+
+# Sentinel distinguishing 'field absent' from legitimate falsy values
+_MISSING = object()
+
+# Leading digits of a 'tof?' response such as '801mm'
+_TOF_RE = re.compile(r'\d+')
+
+# One 'key:value' field of a state line; values may contain commas
+# (e.g. 'mpry:1,180,1') but never ':' or ';'.
+_STATE_RE = re.compile(rb'([^:;]+):([^;]+)')
+
+# PyAV is imported lazily on first video use; its import costs several
+# hundred milliseconds that flight-only scripts should not pay.
+_av = None
+
+
+def _import_av():
+    global _av
+    if _av is None:
+        import av
+        _av = av
+    return _av
+
+# Anchors for converting the monotonic timestamps stored with state packets
+# back to wall-clock datetimes on demand.
+_EPOCH_REAL = time.time()
+_EPOCH_MONO = time.monotonic()
 
 
 class TelloException(Exception):
     pass
 
 
+@lru_cache(maxsize=128)
+def _encode_command(command: str) -> bytes:
+    """Encode a command string to bytes, cached so the fixed SDK commands
+    ('command', 'takeoff', 'battery?', ...) are only encoded once.
+    """
+    return command.encode('utf-8')
+
+
+def _make_rc_sender(sendto, address):
+    """Build a specialized rc sender for one drone with the socket call and
+    target address prebound as free variables, so each tick only does
+    clamp + format + send with no attribute lookups.
+    """
+    def send_rc(a, b, c, d):
+        sendto(b'rc %d %d %d %d' % (
+            -100 if a < -100 else (100 if a > 100 else a),
+            -100 if b < -100 else (100 if b > 100 else b),
+            -100 if c < -100 else (100 if c > 100 else c),
+            -100 if d < -100 else (100 if d > 100 else d)), address)
+
+    return send_rc
+
+
+def _configure_socket(sock: socket.socket):
+    """Enlarge the kernel send/receive buffers so bursts are absorbed even
+    while the interpreter is busy, and allow future port sharing where the
+    platform supports it. The sizes are advisory; the kernel may clamp them
+    to net.core.rmem_max / wmem_max.
+    """
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+
+    # Allow quick rebinding after a restart instead of waiting out the
+    # old socket.
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+    if hasattr(socket, 'SO_REUSEPORT'):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        except OSError:
+            pass
+
+    Tello.LOGGER.debug('Socket receive buffer: %s bytes',
+                       sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF))
+
+
 @enforce_types
 class Tello:
     """Python wrapper to interact with the Ryze Tello drone using the official Tello api.
@@ -39,6 +137,9 @@ class Tello:
     TIME_BTW_COMMANDS = 0.1  # in seconds
     TIME_BTW_RC_CONTROL_COMMANDS = 0.001  # in seconds
     RETRY_COUNT = 3  # number of retries after a failed command
+    # A state snapshot younger than this counts as live telemetry and can
+    # answer query commands without a network round-trip.
+    STATE_FRESHNESS_LIMIT_NS = 200_000_000
     TELLO_IP = '192.168.10.1'  # Tello IP address
 
     # Video stream, server socket
@@ -64,6 +165,15 @@ class Tello:
     CAMERA_FORWARD = 0
     CAMERA_DOWNWARD = 1
 
+    # Command strings for the enumerated video settings, built once so
+    # per-frame bitrate/fps tweaking loops reuse the same objects.
+    _BITRATE_CMDS = {value: 'setbitrate {}'.format(value) for value in range(6)}
+    _RESOLUTION_CMDS = {value: 'setresolution {}'.format(value)
+                        for value in (RESOLUTION_480P, RESOLUTION_720P)}
+    _FPS_CMDS = {value: 'setfps {}'.format(value) for value in (FPS_5, FPS_15, FPS_30)}
+    _DIRECTION_CMDS = {value: 'downvision {}'.format(value)
+                       for value in (CAMERA_FORWARD, CAMERA_DOWNWARD)}
+
     # Set up logger
     HANDLER = logging.StreamHandler()
     FORMATTER = logging.Formatter('[%(levelname)s] %(filename)s - %(lineno)d - %(message)s')
@@ -92,51 +202,78 @@ class Tello:
     state_field_converters = {key : int for key in INT_STATE_FIELDS}
     state_field_converters.update({key : float for key in FLOAT_STATE_FIELDS})
 
+    # bytes-keyed view of state_field_converters so parse_state can match
+    # a raw field key without decoding it; the interned str key is kept
+    # alongside the converter so known fields also skip the key decode.
+    _STATE_FIELDS = {key.encode('ASCII'): (key, converter)
+                     for key, converter in state_field_converters.items()}
+
     # VideoCapture object
     background_frame_read: Optional['BackgroundFrameRead'] = None
 
     stream_on = False
     is_flying = False
+    _ended = False
 
     def __init__(self,
                  host=TELLO_IP,
                  retry_count=RETRY_COUNT,
                  vs_udp=VS_UDP_PORT):
 
-        global threads_initialized, client_socket, drones
+        global threads_initialized, client_socket, state_socket, drones, receiver_thread
 
         self.address = (host, Tello.CONTROL_UDP_PORT)
         self.stream_on = False
+        self._ended = False
         self.retry_count = retry_count
-        self.last_received_command_timestamp = time.time()
-        self.last_rc_control_timestamp = time.time()
+        self.last_received_command_timestamp = time.monotonic()
+        self.last_rc_control_timestamp = time.monotonic()
+        self._last_rc = None
 
         if not threads_initialized:
-            # Run Tello command responses UDP receiver on background
+            # Socket for sending commands and receiving responses
             client_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            _configure_socket(client_socket)
             client_socket.bind(("", Tello.CONTROL_UDP_PORT))
-            response_receiver_thread = Thread(target=Tello.udp_response_receiver)
-            response_receiver_thread.daemon = True
-            response_receiver_thread.start()
 
-            # Run state UDP receiver on background
-            state_receiver_thread = Thread(target=Tello.udp_state_receiver)
-            state_receiver_thread.daemon = True
-            state_receiver_thread.start()
+            # Socket for receiving state packets
+            state_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            _configure_socket(state_socket)
+            state_socket.bind(("", Tello.STATE_UDP_PORT))
+
+            # One background thread services both sockets via a selector
+            receiver_thread = Thread(target=Tello.udp_receiver)
+            receiver_thread.daemon = True
+            receiver_thread.start()
 
             threads_initialized = True
 
-        drones[host] = {'responses': [], 'state': {}}
+        # 'pending' holds one Queue(1) per command currently awaiting its
+        # response; 'responses' is a bounded debugging sink for anything
+        # that arrives with nobody waiting (late replies after a timeout),
+        # inspectable via get_own_udp_object
+        drones[host] = {'responses': deque(maxlen=64), 'pending': deque(),
+                        'state': {}}
+        # cache the entry so the hot paths skip the global dict lookup
+        self._own = drones[host]
+        self._send_rc = _make_rc_sender(client_socket.sendto, self.address)
 
         self.LOGGER.info("Tello instance was initialized. Host: '{}'. Port: '{}'.".format(host, Tello.CONTROL_UDP_PORT))
 
         self.vs_udp_port = vs_udp
+        self._video_url = self._build_video_url()
 
+    def _build_video_url(self) -> str:
+        # overrun_nonfatal + a deeper packet fifo keep FFmpeg's UDP input
+        # from dropping the stream during bursts
+        return 'udp://@{}:{}?overrun_nonfatal=1&fifo_size=5000'.format(
+            self.VS_UDP_IP, self.vs_udp_port)
 
     def change_vs_udp(self, udp_port):
         """Change the UDP Port for sending video feed from the drone.
         """
         self.vs_udp_port = udp_port
+        self._video_url = self._build_video_url()
         self.send_control_command(f'port 8890 {self.vs_udp_port}')
 
     def get_own_udp_object(self):
@@ -144,91 +281,148 @@ class Tello:
         with responses and state information by the receiver threads.
         Internal method, you normally wouldn't call this yourself.
         """
-        global drones
+        return self._own
 
-        host = self.address[0]
-        return drones[host]
+    @staticmethod
+    def udp_receiver():
+        """Service the command-response and state sockets from a single
+        background thread using a selector (epoll on Linux), instead of one
+        blocking thread per socket. Must be run from a background thread in
+        order to not block the main thread.
+        Internal method, you normally wouldn't call this yourself.
+        """
+        selector = selectors.DefaultSelector()
+        client_socket.setblocking(False)
+        state_socket.setblocking(False)
+        selector.register(client_socket, selectors.EVENT_READ, Tello.drain_response_socket)
+        selector.register(state_socket, selectors.EVENT_READ, Tello.drain_state_socket)
+
+        # The timeout bounds how long shutdown waits for the thread; while
+        # traffic is flowing select() returns immediately anyway.
+        while not stop_event.is_set():
+            try:
+                events = selector.select(timeout=0.5)
+            except OSError as e:
+                # The sockets themselves are broken; nothing left to service.
+                Tello.LOGGER.error(e)
+                return
+
+            for key, _ in events:
+                try:
+                    key.data()
+                except Exception as e:
+                    # A malformed datagram must not take down the receiver
+                    # thread; drop it and keep servicing both sockets.
+                    Tello.LOGGER.error(e)
+
+        # Orderly shutdown: only close the sockets once stop_event is set,
+        # so a receive error can never brick the control path.
+        selector.close()
+        client_socket.close()
+        state_socket.close()
 
     @staticmethod
-    def udp_response_receiver():
-        """Setup drone UDP receiver. This method listens for responses of Tello.
-        Must be run from a background thread in order to not block the main thread.
+    def drain_response_socket():
+        """Read all queued command responses and hand each to its drone.
         Internal method, you normally wouldn't call this yourself.
         """
         while True:
             try:
-                data, address = client_socket.recvfrom(1024)
+                n, address = client_socket.recvfrom_into(receive_buffer)
+            except (BlockingIOError, InterruptedError):
+                break
 
-                address = address[0]
-                Tello.LOGGER.debug('Data received from {} at client_socket'.format(address))
+            address = address[0]
+            Tello.LOGGER.debug('Data received from %s at client_socket', address)
 
-                if address not in drones:
-                    continue
+            if address not in drones:
+                continue
 
-                drones[address]['responses'].append(data)
+            entry = drones[address]
+            data = bytes(receive_buffer[:n])
 
-            except Exception as e:
-                Tello.LOGGER.error(e)
-                break
+            # Hand the response to the oldest awaiting command; the Tello
+            # answers commands in the order they were sent.
+            pending = entry['pending']
+            if pending:
+                try:
+                    pending.popleft().put_nowait(data)
+                    continue
+                except IndexError:
+                    # a timed-out sender removed its waiter concurrently
+                    pass
+
+            # Nobody is waiting (e.g. the sender already timed out); keep
+            # the stray reply around for debugging.
+            entry['responses'].append(data)
 
     @staticmethod
-    def udp_state_receiver():
-        """Setup state UDP receiver. This method listens for state information from
-        Tello. Must be run from a background thread in order to not block
-        the main thread.
+    def drain_state_socket():
+        """Read all queued state packets and parse only the newest one per
+        drone; older packets in the same burst are stale.
         Internal method, you normally wouldn't call this yourself.
         """
-        state_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        state_socket.bind(("", Tello.STATE_UDP_PORT))
-
+        latest = {}
         while True:
             try:
-                data, address = state_socket.recvfrom(1024)
+                n, address = state_socket.recvfrom_into(receive_buffer)
+            except (BlockingIOError, InterruptedError):
+                break
+            latest[address[0]] = bytes(receive_buffer[:n])
 
-                address = address[0]
-                Tello.LOGGER.debug('Data received from {} at state_socket'.format(address))
+        for address, data in latest.items():
+            Tello.LOGGER.debug('Data received from %s at state_socket', address)
 
-                if address not in drones:
-                    continue
+            if address not in drones:
+                continue
 
-                data = data.decode('ASCII')
-                data = Tello.parse_state(data)
-                data['received_at'] = datetime.now()
-                drones[address]['state'] = data
-
-            except Exception as e:
-                Tello.LOGGER.error(e)
-                break
+            data = Tello.parse_state(data)
+            # A plain int timestamp; the datetime is only built on demand
+            # in get_last_state_update.
+            data['received_at_ns'] = time.monotonic_ns()
+            # Publish the finished snapshot with a single atomic assignment;
+            # readers always see either the old or the new dict, never a
+            # half-filled one, so the read side stays lock-free.
+            drones[address]['state'] = data
 
     @staticmethod
-    def parse_state(state: str) -> Dict[str, Union[int, float, str]]:
+    def parse_state(state: Union[str, bytes]) -> Dict[str, Union[int, float, str]]:
         """Parse a state line to a dictionary
         Internal method, you normally wouldn't call this yourself.
         """
+        # The state receiver hands in the raw datagram; parsing on bytes
+        # avoids decoding the whole packet up front. int() and float()
+        # accept the value bytes directly.
+        if isinstance(state, str):
+            state = state.encode('ASCII')
         state = state.strip()
-        Tello.LOGGER.debug('Raw state data: {}'.format(state))
+        Tello.LOGGER.debug('Raw state data: %s', state)
 
-        if state == 'ok':
+        if state == b'ok':
             return {}
 
         state_dict = {}
-        for field in state.split(';'):
-            split = field.split(':')
-            if len(split) < 2:
-                continue
-
-            key = split[0]
-            value: Union[int, float, str] = split[1]
-
-            if key in Tello.state_field_converters:
-                num_type = Tello.state_field_converters[key]
+        fields = Tello._STATE_FIELDS
+        # One C-level scan over the packet instead of nested Python-level
+        # split loops; fields without a ':' are skipped implicitly.
+        for match in _STATE_RE.finditer(state):
+            value: Union[int, float, str, bytes] = match.group(2)
+
+            entry = fields.get(match.group(1))
+            if entry is not None:
+                key, num_type = entry
                 try:
                     value = num_type(value)
                 except ValueError as e:
-                    Tello.LOGGER.debug('Error parsing state value for {}: {} to {}'
-                                       .format(key, value, num_type))
+                    Tello.LOGGER.debug('Error parsing state value for %s: %s to %s',
+                                       key, value, num_type)
                     Tello.LOGGER.error(e)
                     continue
+            else:
+                # Unknown fields come from firmware we have not seen; never
+                # let undecodable bytes raise out of the receiver thread.
+                key = match.group(1).decode('ASCII', errors='replace')
+                value = value.decode('ASCII', errors='replace')
 
             state_dict[key] = value
 
@@ -239,18 +433,19 @@ class Tello:
         with all fields.
         Internal method, you normally wouldn't call this yourself.
         """
-        return self.get_own_udp_object()['state']
+        return self._own['state']
 
     def get_state_field(self, key: str):
         """Get a specific sate field by name.
         Internal method, you normally wouldn't call this yourself.
         """
-        state = self.get_current_state()
-
-        if key in state:
-            return state[key]
-        else:
+        # Single dict probe on the happy path; the state dict is empty for
+        # the first few hundred milliseconds after connect, so the miss
+        # branch stays cheap until the raise.
+        value = self._own['state'].get(key, _MISSING)
+        if value is _MISSING:
             raise TelloException('Could not get state property: {}'.format(key))
+        return value
 
     def get_last_state_update(self) -> datetime:
         """Get the datetime of when the last state packet was received.
@@ -258,7 +453,16 @@ class Tello:
         Returns:
             datetime: last state update
         """
-        return self.get_state_field('received_at')
+        received_at_ns = self.get_state_field('received_at_ns')
+        return datetime.fromtimestamp(_EPOCH_REAL + (received_at_ns / 1e9 - _EPOCH_MONO))
+
+    def get_last_state_age_ns(self) -> int:
+        """Get the age of the current state snapshot in nanoseconds.
+        Cheaper than get_last_state_update when you only need freshness.
+        Returns:
+            int: nanoseconds since the last state packet was received
+        """
+        return time.monotonic_ns() - self.get_state_field('received_at_ns')
 
     def get_mission_pad_id(self) -> int:
         """Mission pad ID of the currently detected mission pad
@@ -418,19 +622,27 @@ class Tello:
     def get_udp_video_address(self) -> str:
         """Internal method, you normally wouldn't call this youself.
         """
-        address_schema = 'udp://@{ip}:{port}'  # + '?overrun_nonfatal=1&fifo_size=5000'
-        address = address_schema.format(ip=self.VS_UDP_IP, port=self.vs_udp_port)
-        return address
+        return self._video_url
 
-    def get_frame_read(self, with_queue = False, max_queue_len = 32) -> 'BackgroundFrameRead':
+    def get_frame_read(self, with_queue = False, max_queue_len = 32,
+                       hwaccel: Optional[str] = None,
+                       target_size: Optional[Tuple[int, int]] = None) -> 'BackgroundFrameRead':
         """Get the BackgroundFrameRead object from the camera drone. Then, you just need to call
         backgroundFrameRead.frame to get the actual frame received by the drone.
+        Arguments:
+            hwaccel: optional hardware decoder device type, e.g. 'cuda' or
+                'vaapi'. Decoding falls back to software if the device is
+                unavailable.
+            target_size: optional (width, height) the decoder rescales
+                frames to in the same libswscale pass as the color
+                conversion.
         Returns:
             BackgroundFrameRead
         """
         if self.background_frame_read is None:
             address = self.get_udp_video_address()
-            self.background_frame_read = BackgroundFrameRead(self, address, with_queue, max_queue_len)
+            self.background_frame_read = BackgroundFrameRead(self, address, with_queue, max_queue_len,
+                                                             hwaccel=hwaccel, target_size=target_size)
             self.background_frame_read.start()
         return self.background_frame_read
 
@@ -442,28 +654,44 @@ class Tello:
         """
         # Commands very consecutive makes the drone not respond to them.
         # So wait at least self.TIME_BTW_COMMANDS seconds
-        diff = time.time() - self.last_received_command_timestamp
-        if diff < self.TIME_BTW_COMMANDS:
-            self.LOGGER.debug('Waiting {} seconds to execute command: {}...'.format(diff, command))
-            time.sleep(diff)
+        wait = self.TIME_BTW_COMMANDS - (time.monotonic() - self.last_received_command_timestamp)
+        if wait > 0:
+            self.LOGGER.debug('Waiting %s seconds to execute command: %s...', wait, command)
+            time.sleep(wait)
 
         self.LOGGER.info("Send command: '{}'".format(command))
-        timestamp = time.time()
 
-        client_socket.sendto(command.encode('utf-8'), self.address)
+        # Each in-flight command gets its own single-slot queue that the
+        # receiver thread completes, so concurrent callers never steal
+        # each other's responses.
+        waiter = Queue(1)
+        pending = self._own['pending']
+        # registered before sendto so the response cannot slip past
+        pending.append(waiter)
 
-        responses = self.get_own_udp_object()['responses']
+        client_socket.sendto(_encode_command(command), self.address)
+
+        try:
+            first_response = waiter.get(timeout=timeout)
+        except Empty:
+            try:
+                pending.remove(waiter)
+                first_response = None
+            except ValueError:
+                # The receiver popped the waiter just as the timeout hit;
+                # the response is in (or about to enter) the queue.
+                try:
+                    first_response = waiter.get(timeout=0.1)
+                except Empty:
+                    first_response = None
 
-        while not responses:
-            if time.time() - timestamp > timeout:
+            if first_response is None:
                 message = "Aborting command '{}'. Did not receive a response after {} seconds".format(command, timeout)
                 self.LOGGER.warning(message)
                 return message
-            time.sleep(0.1)  # Sleep during send command
 
-        self.last_received_command_timestamp = time.time()
+        self.last_received_command_timestamp = time.monotonic()
 
-        first_response = responses.pop(0)  # first datum from socket
         try:
             response = first_response.decode("utf-8")
         except UnicodeDecodeError as e:
@@ -481,7 +709,7 @@ class Tello:
         # Commands very consecutive makes the drone not respond to them. So wait at least self.TIME_BTW_COMMANDS seconds
 
         self.LOGGER.info("Send command (no response expected): '{}'".format(command))
-        client_socket.sendto(command.encode('utf-8'), self.address)
+        client_socket.sendto(_encode_command(command), self.address)
 
     def send_control_command(self, command: str, timeout: int = RESPONSE_TIMEOUT) -> bool:
         """Send control command to Tello and wait for its response.
@@ -491,10 +719,13 @@ class Tello:
         for i in range(0, self.retry_count):
             response = self.send_command_with_return(command, timeout=timeout)
 
+            # Substring rather than prefix match: the RMTT expansion board
+            # answers EXT commands with e.g. 'led ok', and the scan runs
+            # only once per network round-trip anyway.
             if 'ok' in response.lower():
                 return True
 
-            self.LOGGER.debug("Command attempt #{} failed for command: '{}'".format(i, command))
+            self.LOGGER.debug("Command attempt #%s failed for command: '%s'", i, command)
 
         self.raise_result_error(command, response)
         return False # never reached
@@ -551,7 +782,7 @@ class Tello:
             for i in range(REPS):
                 if self.get_current_state():
                     t = i / REPS  # in seconds
-                    Tello.LOGGER.debug("'.connect()' received first state packet after {} seconds".format(t))
+                    Tello.LOGGER.debug("'.connect()' received first state packet after %s seconds", t)
                     break
                 time.sleep(1 / REPS)
 
@@ -632,7 +863,7 @@ class Tello:
             direction: up, down, left, right, forward or back
             x: 20-500
         """
-        self.send_control_command("{} {}".format(direction, x))
+        self.send_control_command(f"{direction} {x}")
 
     def move_up(self, x: int):
         """Fly x cm up.
@@ -681,14 +912,14 @@ class Tello:
         Arguments:
             x: 1-360
         """
-        self.send_control_command("cw {}".format(x))
+        self.send_control_command(f"cw {x}")
 
     def rotate_counter_clockwise(self, x: int):
         """Rotate x degree counter-clockwise.
         Arguments:
             x: 1-3600
         """
-        self.send_control_command("ccw {}".format(x))
+        self.send_control_command(f"ccw {x}")
 
     def flip(self, direction: str):
         """Do a flip maneuver.
@@ -696,7 +927,7 @@ class Tello:
         Arguments:
             direction: l (left), r (right), f (forward) or b (back)
         """
-        self.send_control_command("flip {}".format(direction))
+        self.send_control_command(f"flip {direction}")
 
     def flip_left(self):
         """Flip to the left.
@@ -727,7 +958,7 @@ class Tello:
             z: -500-500
             speed: 10-100
         """
-        cmd = 'go {} {} {} {}'.format(x, y, z, speed)
+        cmd = f'go {x} {y} {z} {speed}'
         self.send_control_command(cmd)
 
     def stop(self):
@@ -752,7 +983,7 @@ class Tello:
             z2: -500-500
             speed: 10-60
         """
-        cmd = 'curve {} {} {} {} {} {} {}'.format(x1, y1, z1, x2, y2, z2, speed)
+        cmd = f'curve {x1} {y1} {z1} {x2} {y2} {z2} {speed}'
         self.send_control_command(cmd)
 
     def go_xyz_speed_mid(self, x: int, y: int, z: int, speed: int, mid: int):
@@ -765,7 +996,7 @@ class Tello:
             speed: 10-100
             mid: 1-8
         """
-        cmd = 'go {} {} {} {} m{}'.format(x, y, z, speed, mid)
+        cmd = f'go {x} {y} {z} {speed} m{mid}'
         self.send_control_command(cmd)
 
     def curve_xyz_speed_mid(self, x1: int, y1: int, z1: int, x2: int, y2: int, z2: int, speed: int, mid: int):
@@ -786,7 +1017,7 @@ class Tello:
             speed: 10-60
             mid: 1-8
         """
-        cmd = 'curve {} {} {} {} {} {} {} m{}'.format(x1, y1, z1, x2, y2, z2, speed, mid)
+        cmd = f'curve {x1} {y1} {z1} {x2} {y2} {z2} {speed} m{mid}'
         self.send_control_command(cmd)
 
     def go_xyz_speed_yaw_mid(self, x: int, y: int, z: int, speed: int, yaw: int, mid1: int, mid2: int):
@@ -802,7 +1033,7 @@ class Tello:
             mid1: 1-8
             mid2: 1-8
         """
-        cmd = 'jump {} {} {} {} {} m{} m{}'.format(x, y, z, speed, yaw, mid1, mid2)
+        cmd = f'jump {x} {y} {z} {speed} {yaw} m{mid1} m{mid2}'
         self.send_control_command(cmd)
 
     def enable_mission_pads(self):
@@ -822,15 +1053,18 @@ class Tello:
         Arguments:
             x: 0 downwards only, 1 forwards only, 2 both directions
         """
-        self.send_control_command("mdirection {}".format(x))
+        self.send_control_command(f"mdirection {x}")
 
     def set_speed(self, x: int):
         """Set speed to x cm/s.
         Arguments:
             x: 10-100
         """
-        self.send_control_command("speed {}".format(x))
+        self.send_control_command(f"speed {x}")
 
+    # The highest-frequency method in the library opts out of the
+    # enforce_types wrapper; the velocities are clamped on send anyway.
+    @no_type_check
     def send_rc_control(self, left_right_velocity: int, forward_backward_velocity: int, up_down_velocity: int,
                         yaw_velocity: int):
         """Send RC control via four channels. Command is sent every self.TIME_BTW_RC_CONTROL_COMMANDS seconds.
@@ -840,23 +1074,32 @@ class Tello:
             up_down_velocity: -100~100 (up/down)
             yaw_velocity: -100~100 (yaw)
         """
-        def clamp100(x: int) -> int:
-            return max(-100, min(100, x))
-
-        if time.time() - self.last_rc_control_timestamp > self.TIME_BTW_RC_CONTROL_COMMANDS:
-            self.last_rc_control_timestamp = time.time()
-            cmd = 'rc {} {} {} {}'.format(
-                clamp100(left_right_velocity),
-                clamp100(forward_backward_velocity),
-                clamp100(up_down_velocity),
-                clamp100(yaw_velocity)
-            )
-            self.send_command_without_return(cmd)
+        # This is the highest-frequency path in the library: after the
+        # throttle check all work happens in the prebuilt per-instance
+        # sender, skipping the logging and encode overhead of
+        # send_command_without_return.
+        now = time.monotonic()
+        elapsed = now - self.last_rc_control_timestamp
+        if elapsed <= self.TIME_BTW_RC_CONTROL_COMMANDS:
+            return
+
+        # Identical sticks don't need a packet — the drone keeps executing
+        # the last rc command it received. Resend after one second anyway
+        # as a keep-alive for the drone's command watchdog.
+        channels = (left_right_velocity, forward_backward_velocity,
+                    up_down_velocity, yaw_velocity)
+        if channels == self._last_rc and elapsed < 1.0:
+            return
+
+        self._last_rc = channels
+        self.last_rc_control_timestamp = now
+        self._send_rc(left_right_velocity, forward_backward_velocity,
+                      up_down_velocity, yaw_velocity)
 
     def set_wifi_credentials(self, ssid: str, password: str):
         """Set the Wi-Fi SSID and password. The Tello will reboot afterwords.
         """
-        cmd = 'wifi {} {}'.format(ssid, password)
+        cmd = f'wifi {ssid} {password}'
         self.send_control_command(cmd)
 
     def connect_to_wifi(self, ssid: str, password: str):
@@ -864,7 +1107,7 @@ class Tello:
         After this command the tello will reboot.
         Only works with Tello EDUs.
         """
-        cmd = 'ap {} {}'.format(ssid, password)
+        cmd = f'ap {ssid} {password}'
         self.send_control_command(cmd)
 
     def set_network_ports(self, state_packet_port: int, video_stream_port: int):
@@ -872,7 +1115,7 @@ class Tello:
         While you can use this command to reconfigure the Tello this library currently does not support
         non-default ports (TODO!)
         """
-        cmd = 'port {} {}'.format(state_packet_port, video_stream_port)
+        cmd = f'port {state_packet_port} {video_stream_port}'
         self.send_control_command(cmd)
 
     def reboot(self):
@@ -890,7 +1133,7 @@ class Tello:
             Tello.BITRATE_4MBPS
             Tello.BITRATE_5MBPS
         """
-        cmd = 'setbitrate {}'.format(bitrate)
+        cmd = Tello._BITRATE_CMDS.get(bitrate) or f'setbitrate {bitrate}'
         self.send_control_command(cmd)
 
     def set_video_resolution(self, resolution: str):
@@ -899,7 +1142,7 @@ class Tello:
             Tello.RESOLUTION_480P
             Tello.RESOLUTION_720P
         """
-        cmd = 'setresolution {}'.format(resolution)
+        cmd = Tello._RESOLUTION_CMDS.get(resolution) or f'setresolution {resolution}'
         self.send_control_command(cmd)
 
     def set_video_fps(self, fps: str):
@@ -909,7 +1152,7 @@ class Tello:
             Tello.FPS_15
             Tello.FPS_30
         """
-        cmd = 'setfps {}'.format(fps)
+        cmd = Tello._FPS_CMDS.get(fps) or f'setfps {fps}'
         self.send_control_command(cmd)
 
     def set_video_direction(self, direction: int):
@@ -920,15 +1163,26 @@ class Tello:
             Tello.CAMERA_FORWARD
             Tello.CAMERA_DOWNWARD
         """
-        cmd = 'downvision {}'.format(direction)
+        cmd = Tello._DIRECTION_CMDS.get(direction) or f'downvision {direction}'
         self.send_control_command(cmd)
 
     def send_expansion_command(self, expansion_cmd: str):
         """Sends a command to the ESP32 expansion board connected to a Tello Talent
         Use e.g. tello.send_expansion_command("led 255 0 0") to turn the top led red.
         """
-        cmd = 'EXT {}'.format(expansion_cmd)
-        self.send_control_command(cmd)
+        self.send_control_command('EXT ' + expansion_cmd)
+
+    def _fresh_state_value(self, key: str):
+        """Return a field from the pushed state stream if the snapshot is
+        fresh enough, else None to signal a network query is needed.
+        Internal method, you normally wouldn't call this yourself.
+        """
+        state = self._own['state']
+        received_at_ns = state.get('received_at_ns')
+        if received_at_ns is None \
+                or time.monotonic_ns() - received_at_ns > Tello.STATE_FRESHNESS_LIMIT_NS:
+            return None
+        return state.get(key)
 
     def query_speed(self) -> int:
         """Query speed setting (cm/s)
@@ -938,52 +1192,81 @@ class Tello:
         return self.send_read_command_int('speed?')
 
     def query_battery(self) -> int:
-        """Get current battery percentage via a query command
-        Using get_battery is usually faster
+        """Get current battery percentage, answered from the pushed state
+        stream when fresh (same value as get_battery), falling back to a
+        network query.
         Returns:
             int: 0-100 in %
         """
+        battery = self._fresh_state_value('bat')
+        if battery is not None:
+            return battery
         return self.send_read_command_int('battery?')
 
     def query_flight_time(self) -> int:
-        """Query current fly time (s).
-        Using get_flight_time is usually faster.
+        """Query current fly time (s), answered from the pushed state stream
+        when fresh (same value as get_flight_time), falling back to a
+        network query.
         Returns:
             int: Seconds elapsed during flight.
         """
+        flight_time = self._fresh_state_value('time')
+        if flight_time is not None:
+            return flight_time
         return self.send_read_command_int('time?')
 
     def query_height(self) -> int:
         """Get height in cm via a query command.
-        Using get_height is usually faster
+        Answered from the pushed state stream when telemetry is live
+        (same value as get_height), falling back to a network query.
         Returns:
             int: 0-3000
         """
+        height = self._fresh_state_value('h')
+        if height is not None:
+            return height
         return self.send_read_command_int('height?')
 
     def query_temperature(self) -> int:
         """Query temperature (°C).
-        Using get_temperature is usually faster.
+        Answered from the pushed state stream when telemetry is live,
+        falling back to a network query.
         Returns:
             int: 0-90
         """
+        templ = self._fresh_state_value('templ')
+        temph = self._fresh_state_value('temph')
+        if templ is not None and temph is not None:
+            return (templ + temph) // 2
         return self.send_read_command_int('temp?')
 
     def query_attitude(self) -> dict:
         """Query IMU attitude data.
-        Using get_pitch, get_roll and get_yaw is usually faster.
+        Answered from the pushed state stream when telemetry is live,
+        falling back to a network query.
         Returns:
             {'pitch': int, 'roll': int, 'yaw': int}
         """
+        pitch = self._fresh_state_value('pitch')
+        roll = self._fresh_state_value('roll')
+        yaw = self._fresh_state_value('yaw')
+        if pitch is not None and roll is not None and yaw is not None:
+            return {'pitch': pitch, 'roll': roll, 'yaw': yaw}
+
         response = self.send_read_command('attitude?')
         return Tello.parse_state(response)
 
     def query_barometer(self) -> int:
         """Get barometer value (cm)
-        Using get_barometer is usually faster.
+        Answered from the pushed state stream when telemetry is live,
+        falling back to a network query.
         Returns:
             int: 0-100
         """
+        baro = self._fresh_state_value('baro')
+        if baro is not None:
+            return int(baro * 100)
+
         baro = self.send_read_command_int('baro?')
         return baro * 100
 
@@ -995,7 +1278,10 @@ class Tello:
         """
         # example response: 801mm
         tof = self.send_read_command('tof?')
-        return int(tof[:-2]) / 10
+        match = _TOF_RE.match(tof)
+        if match is None:
+            raise TelloException('Unexpected tof response: {}'.format(tof))
+        return int(match.group()) / 10
 
     def query_wifi_signal_noise_ratio(self) -> str:
         """Get Wi-Fi SNR
@@ -1027,13 +1313,24 @@ class Tello:
 
     def end(self):
         """Call this method when you want to end the tello object
+
+        The final land/streamoff are sent fire-and-forget over the open
+        socket, so teardown does not block on response round-trips and
+        retries; calling end() a second time is a no-op.
         """
+        if self._ended:
+            return
+        self._ended = True
+
         try:
             if self.is_flying:
-                self.land()
+                self.send_command_without_return('land')
+                self.is_flying = False
             if self.stream_on:
-                self.streamoff()
-        except TelloException:
+                self.send_command_without_return('streamoff')
+                self.stream_on = False
+        except OSError:
+            # the drone may already be unreachable or the socket closed
             pass
 
         if self.background_frame_read is not None:
@@ -1045,7 +1342,37 @@ class Tello:
             del drones[host]
 
     def __del__(self):
-        self.end()
+        # No network teardown while the interpreter is finalizing: the
+        # receiver thread and sockets may already be gone, and the drone
+        # lands on link loss via its own watchdog.
+        if sys.is_finalizing():
+            return
+
+        try:
+            self.end()
+        except AttributeError:
+            # the constructor raised before the instance was fully set up
+            pass
+
+
+# Template for the placeholder each BackgroundFrameRead publishes until
+# the first real frame arrives. Instances hand out a writable copy:
+# consumers draw on frames in place (e.g. cv2.putText), which must work
+# during the startup window too. The shared template stays read-only.
+_PLACEHOLDER_FRAME = np.zeros((300, 400, 3), dtype=np.uint8)
+_PLACEHOLDER_FRAME.setflags(write=False)
+
+# Planar frame published by BackgroundFrameRead in yuv420p mode; u and v
+# are at half resolution.
+YUVFrame = namedtuple('YUVFrame', ['y', 'u', 'v'])
+
+
+def _plane_view(plane, height, width):
+    """Wrap one VideoFrame plane as a numpy view without copying. The
+    plane rows may be padded to line_size, so the view is sliced back to
+    the visible width.
+    """
+    return np.frombuffer(plane, dtype=np.uint8).reshape(-1, plane.line_size)[:height, :width]
 
 
 class BackgroundFrameRead:
@@ -1054,23 +1381,65 @@ class BackgroundFrameRead:
     backgroundFrameRead.frame to get the current frame.
     """
 
-    def __init__(self, tello, address, with_queue = False, maxsize = 32):
+    def __init__(self, tello, address, with_queue = False, maxsize = 32,
+                 hwaccel: Optional[str] = None, format: str = 'rgb24',
+                 target_size: Optional[Tuple[int, int]] = None):
         self.address = address
-        self.lock = Lock()
-        self.frame = np.zeros([300, 400, 3], dtype=np.uint8)
-        self.frames = deque([], maxsize)
+        self.frame = _PLACEHOLDER_FRAME.copy()
+        # (width, height) to rescale decoded frames to; libswscale fuses
+        # the color conversion and the resize into a single pass, which is
+        # much cheaper than resizing the full rgb frame afterwards.
+        self.target_size = target_size
         self.with_queue = with_queue
+        self.maxsize = maxsize
+        # 'yuv420p' publishes zero-copy planar views of the decoded frame
+        # as a YUVFrame(y, u, v) named tuple instead of converting to rgb;
+        # the views alias decoder memory, so they cannot be queued.
+        self.format = format
+        if format == 'yuv420p' and with_queue:
+            raise TelloException('yuv420p frames alias decoder memory and cannot be queued')
+        # Queue mode uses a ring of preallocated buffers, sized lazily
+        # from the first decoded frame; head/tail are monotonically
+        # increasing indices into the ring.
+        self._ring = None
+        self._head = 0
+        self._tail = 0
+
+        av = _import_av()
+
+        open_kwargs = {}
+        if hwaccel is not None:
+            # Offload H.264 decoding to the gpu (e.g. 'cuda' for NVDEC);
+            # software decode remains the fallback if the device is missing.
+            try:
+                from av.codec.hwaccel import HWAccel
+            except ImportError:
+                raise TelloException('hwaccel requires PyAV >= 12.0.0; '
+                                     'upgrade the av package or drop the hwaccel argument')
+            open_kwargs['hwaccel'] = HWAccel(device_type=hwaccel,
+                                             allow_software_fallback=True)
 
         # Try grabbing frame with PyAV
         # According to issue #90 the decoder might need some time
         # https://github.com/damiafuentes/DJITelloPy/issues/90#issuecomment-855458905
         try:
             Tello.LOGGER.debug('trying to grab video frames...')
-            self.container = av.open(self.address, timeout=(Tello.FRAME_GRAB_TIMEOUT, None))
+            # nobuffer/low_delay keep the demuxer from accumulating input
+            # before handing packets to the decoder, trimming end-to-end
+            # video latency on the live stream.
+            self.container = av.open(self.address, timeout=(Tello.FRAME_GRAB_TIMEOUT, None),
+                                     options={'fflags': 'nobuffer', 'flags': 'low_delay'},
+                                     **open_kwargs)
         except av.error.ExitError:
             raise TelloException('Failed to grab video frames from video stream')
 
-        self.stopped = False
+        # Enable FFmpeg's internal frame/slice threading; 0 lets the
+        # decoder pick a thread count for the machine.
+        self.stream = self.container.streams.video[0]
+        self.stream.thread_type = 'AUTO'
+        self.stream.codec_context.thread_count = 0
+
+        self._stop = Event()
         self.worker = Thread(target=self.update_frame, args=(), daemon=True)
 
     def start(self):
@@ -1079,18 +1448,76 @@ class BackgroundFrameRead:
         """
         self.worker.start()
 
+        # Best effort: lift the decode thread to round-robin real-time
+        # scheduling so a busy main thread cannot starve it into the
+        # 'Do not have enough frames' error. Requires CAP_SYS_NICE on
+        # Linux and is silently skipped where unsupported or denied.
+        if hasattr(os, 'sched_setscheduler'):
+            try:
+                os.sched_setscheduler(self.worker.native_id, os.SCHED_RR,
+                                      os.sched_param(1))
+            except (OSError, PermissionError):
+                pass
+
     def update_frame(self):
         """Thread worker function to retrieve frames using PyAV
         Internal method, you normally wouldn't call this yourself.
         """
+        av = _import_av()
         try:
-            for frame in self.container.decode(video=0):
-                if self.with_queue:
-                    self.frames.append(np.array(frame.to_image()))
-                else:
-                    self.frame = np.array(frame.to_image())
-
-                if self.stopped:
+            # Two persistent buffers are ping-ponged in non-queue mode so
+            # steady-state decoding reuses the same memory instead of
+            # handing a fresh multi-megabyte array to the allocator 30
+            # times a second. The published frame stays valid until the
+            # frame after next; consumers that keep frames longer must
+            # copy them.
+            buffers = None
+            idx = 0
+            # Demux and decode explicitly instead of the high-level
+            # container.decode(video=0) iterator; one demuxed packet can
+            # yield several frames and the per-frame Python overhead is
+            # amortized over the packet.
+            for packet in self.container.demux(self.stream):
+                for frame in packet.decode():
+                    if self.format == 'yuv420p':
+                        # Publish zero-copy views over the decoder's own
+                        # plane buffers — no color conversion, no copy.
+                        # They are valid until the next frame is decoded;
+                        # consumers copy or process inline.
+                        self.frame = YUVFrame(
+                            _plane_view(frame.planes[0], frame.height, frame.width),
+                            _plane_view(frame.planes[1], frame.height // 2, frame.width // 2),
+                            _plane_view(frame.planes[2], frame.height // 2, frame.width // 2))
+                        continue
+
+                    if self.target_size is not None:
+                        width, height = self.target_size
+                        frame = frame.reformat(width=width, height=height,
+                                               format='rgb24')
+
+                    # to_ndarray converts straight into a numpy buffer via
+                    # libswscale, skipping the PIL Image round-trip and the
+                    # extra full-frame copy of np.array(frame.to_image()).
+                    decoded = frame.to_ndarray(format='rgb24')
+                    if self.with_queue:
+                        if self._ring is None or self._ring[0].shape != decoded.shape:
+                            self._ring = [np.empty_like(decoded) for _ in range(self.maxsize)]
+                            self._head = self._tail = 0
+                        # Only the decode thread writes _head and only the
+                        # consumer writes _tail; when the ring is full the
+                        # oldest slot is simply overwritten and the consumer
+                        # skips ahead, matching the old bounded-deque
+                        # drop-oldest behavior without a shared counter.
+                        np.copyto(self._ring[self._head % self.maxsize], decoded)
+                        self._head += 1
+                    else:
+                        if buffers is None or buffers[0].shape != decoded.shape:
+                            buffers = [np.empty_like(decoded), np.empty_like(decoded)]
+                        idx = 1 - idx
+                        np.copyto(buffers[idx], decoded)
+                        self.frame = buffers[idx]
+
+                if self._stop.is_set():
                     self.container.close()
                     break
         except av.error.ExitError:
@@ -1099,12 +1526,22 @@ class BackgroundFrameRead:
     def get_queued_frame(self):
         """
         Get a frame from the queue
+
+        The returned buffer belongs to the ring and is overwritten once
+        maxsize newer frames have been decoded; copy it if you keep it.
         """
-        with self.lock:
-            try:
-                return self.frames.popleft()
-            except IndexError:
-                return None
+        # The producer overwrites the oldest slot when the ring is full;
+        # skip ahead past anything it has already lapped, plus one slot of
+        # slack because slot head % maxsize is the producer's next write
+        # target. _tail is written by this thread only.
+        head = self._head
+        self._tail = max(self._tail, head - self.maxsize + 1)
+        if self._tail >= head:
+            return None
+
+        buffer = self._ring[self._tail % self.maxsize]
+        self._tail += 1
+        return buffer
 
     @property
     def frame(self):
@@ -1114,16 +1551,26 @@ class BackgroundFrameRead:
         if self.with_queue:
             return self.get_queued_frame()
 
-        with self.lock:
-            return self._frame
+        # A single attribute load/store is atomic under the GIL, so
+        # publishing the frame pointer needs no lock; readers see either
+        # the previous or the new array, never a torn value.
+        return self._frame
 
     @frame.setter
     def frame(self, value):
-        with self.lock:
-            self._frame = value
+        self._frame = value
+
+    @property
+    def stopped(self):
+        """Whether the frame update worker has been stopped, e.g. by
+        streamoff or tello.end().
+        """
+        return self._stop.is_set()
 
     def stop(self):
-        """Stop the frame update worker
+        """Stop the frame update worker and wait briefly for it to exit
         Internal method, you normally wouldn't call this yourself.
         """
-        self.stopped = True
+        self._stop.set()
+        if self.worker.is_alive():
+            self.worker.join(timeout=1)